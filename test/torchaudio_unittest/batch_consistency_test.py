@@ -280,3 +280,44 @@ class TestTransforms(common_utils.TorchaudioTestCase):
         # Batch then transform
         computed = torchaudio.transforms.Vol(gain=1.1)(waveform.repeat(3, 1, 1))
         self.assertEqual(computed, expected)
+
+
+class TestKaldi(common_utils.TorchaudioTestCase):
+    """Test batched functions defined in `compliance.kaldi` module"""
+    def assert_batch_consistency(self, functional, batch_functional, **kwargs):
+        waveform = common_utils.get_whitenoise(sample_rate=16000, duration=0.5, n_channels=3)
+
+        # Single then transform then batch
+        expected = torch.stack([functional(w.unsqueeze(0), **kwargs) for w in waveform])
+
+        # Batch then transform
+        computed = batch_functional(waveform, **kwargs)
+        self.assertEqual(computed, expected, atol=1e-5, rtol=1e-5)
+
+    @parameterized.expand([
+        ({}, ),
+        ({'snip_edges': False, 'subtract_mean': True}, ),
+    ])
+    def test_spectrogram_batch(self, kwargs):
+        self.assert_batch_consistency(
+            torchaudio.compliance.kaldi.spectrogram, torchaudio.compliance.kaldi.spectrogram_batch, **kwargs)
+
+    @parameterized.expand([
+        ({}, ),
+        ({'snip_edges': False, 'subtract_mean': True}, ),
+        ({'use_energy': True, 'htk_compat': True, 'vtln_warp': 0.9}, ),
+        ({'num_mel_bins': 128}, ),
+    ])
+    def test_fbank_batch(self, kwargs):
+        self.assert_batch_consistency(
+            torchaudio.compliance.kaldi.fbank, torchaudio.compliance.kaldi.fbank_batch, **kwargs)
+
+    @parameterized.expand([
+        ({}, ),
+        ({'snip_edges': False, 'subtract_mean': True}, ),
+        ({'use_energy': True, 'htk_compat': True}, ),
+        ({'htk_compat': True, 'cepstral_lifter': 0.0}, ),
+    ])
+    def test_mfcc_batch(self, kwargs):
+        self.assert_batch_consistency(
+            torchaudio.compliance.kaldi.mfcc, torchaudio.compliance.kaldi.mfcc_batch, **kwargs)
@@ -248,3 +248,171 @@ class Test_Kaldi(common_utils.TempDirMixin, common_utils.TorchaudioTestCase):
             single_channel_sampled = kaldi.resample_waveform(single_channel, self.test1_signal_sr,
                                                              self.test1_signal_sr // 2)
             torch.testing.assert_allclose(multi_sound_sampled[i, :], single_channel_sampled[0], rtol=1e-4, atol=1e-7)
+
+
+class TestKaldiResample(common_utils.TorchaudioTestCase):
+    def _resample_waveform_reference(self, waveform, orig_freq, new_freq, lowpass_filter_width=6):
+        # resample each output phase separately from the weights of kaldi, with zeros outside of the signal
+        base_freq = math.gcd(orig_freq, new_freq)
+        input_samples_in_unit = orig_freq // base_freq
+        output_samples_in_unit = new_freq // base_freq
+        lowpass_cutoff = 0.99 * 0.5 * min(orig_freq, new_freq)
+        window_width = lowpass_filter_width / (2.0 * lowpass_cutoff)
+        first_indices, weights = kaldi._get_LR_indices_and_weights(
+            orig_freq, new_freq, output_samples_in_unit, window_width, lowpass_cutoff, lowpass_filter_width,
+            waveform.device, waveform.dtype)
+        first_indices = first_indices.long()
+
+        num_channels, wave_len = waveform.shape
+        tot_output_samp = kaldi._get_num_LR_output_samples(wave_len, orig_freq, new_freq)
+        padding = weights.size(1) + input_samples_in_unit + int(first_indices.abs().max())
+        padded = torch.nn.functional.pad(waveform, (padding, padding))
+        output = waveform.new_zeros(num_channels, tot_output_samp)
+        for phase in range(output_samples_in_unit):
+            output_index = torch.arange(phase, tot_output_samp, output_samples_in_unit)
+            starts = first_indices[phase] + (output_index // output_samples_in_unit) * input_samples_in_unit
+            index = padding + starts.unsqueeze(1) + torch.arange(weights.size(1)).unsqueeze(0)
+            output[:, output_index] = padded[:, index].matmul(weights[phase])
+        return output
+
+    def test_resample_waveform_phase_groups(self):
+        # these ratios have enough phases for the kernel to be split in several groups
+        sound = common_utils.get_whitenoise(sample_rate=16000, duration=0.5)
+        sound = torch.cat([sound, sound.flip(-1)]).double()
+        for orig_freq, new_freq in [(44100, 16000), (16000, 12345)]:
+            kernels, _ = kaldi._get_LR_kernels(orig_freq, new_freq, 6, sound.device, sound.dtype)
+            self.assertGreater(len(kernels), 1)
+
+            expected = self._resample_waveform_reference(sound, orig_freq, new_freq)
+            computed = kaldi.resample_waveform(sound, orig_freq, new_freq)
+            self.assertEqual(computed, expected, atol=1e-10, rtol=1e-8)
+
+    @common_utils.skipIfNoCuda
+    def test_resample_waveform_cuda(self):
+        # the conv1d used on CUDA gives the same output as the matmul used on CPU
+        sound = common_utils.get_whitenoise(sample_rate=16000, duration=0.5, n_channels=2)
+        for new_freq in [8000, 32000, 48000, 22050]:
+            expected = kaldi.resample_waveform(sound, 16000, new_freq)
+            computed = kaldi.resample_waveform(sound.cuda(), 16000, new_freq)
+            self.assertEqual(computed.cpu(), expected, atol=1e-5, rtol=1e-5)
+
+
+@common_utils.skipIfNoModule('numba')
+class TestKaldiNumba(common_utils.TorchaudioTestCase):
+    def test_fbank_numba(self):
+        """The numba backend of fbank gives the same output as the torch backend"""
+        waveform = common_utils.get_whitenoise(sample_rate=16000, duration=0.5, n_channels=2)
+        for kwargs in [{}, {'raw_energy': False, 'use_energy': True}, {'window_type': 'hamming'}]:
+            expected = kaldi.fbank_batch(waveform, **kwargs)
+            computed = kaldi.fbank_batch(waveform, backend='numba', **kwargs)
+            self.assertEqual(computed, expected, atol=1e-4, rtol=1e-5)
+
+
+class TestKaldiStreaming(common_utils.TorchaudioTestCase):
+    def _get_waveform(self, seed, device='cpu'):
+        # two channels which differ, of 0.5 s at 16 kHz
+        return torch.cat([
+            common_utils.get_whitenoise(sample_rate=16000, duration=0.5, seed=seed, device=device),
+            common_utils.get_whitenoise(sample_rate=16000, duration=0.5, seed=seed + 100, device=device),
+        ])
+
+    def _test_streaming_fallback(self, streaming_fn, batch_fn):
+        for kwargs in [{}, {'use_energy': True, 'htk_compat': True}]:
+            waveform = self._get_waveform(0)
+            self.assertEqual(streaming_fn(waveform, **kwargs), batch_fn(waveform, **kwargs))
+
+    def _test_streaming_replay(self, streaming_fn, batch_fn):
+        kwargs = {'use_energy': True, 'htk_compat': True}
+        waveform1 = self._get_waveform(0, 'cuda')
+        waveform2 = self._get_waveform(1, 'cuda')
+        # the first call captures the graph, the next ones replay it
+        streaming_fn(waveform1, **kwargs)
+        computed1 = streaming_fn(waveform1, **kwargs)
+        computed2 = streaming_fn(waveform2, **kwargs)
+        # the output of a replay is not overwritten by the next one
+        self.assertEqual(computed1, batch_fn(waveform1, **kwargs), atol=1e-4, rtol=1e-4)
+        self.assertEqual(computed2, batch_fn(waveform2, **kwargs), atol=1e-4, rtol=1e-4)
+
+    def _test_streaming_replay_dither(self, streaming_fn, batch_fn):
+        kwargs = {'dither': 1e-4}
+        waveform = self._get_waveform(0, 'cuda')
+        streaming_fn(waveform, **kwargs)
+        computed1 = streaming_fn(waveform, **kwargs)
+        computed2 = streaming_fn(waveform, **kwargs)
+        # the noise is drawn again on each replay instead of being frozen in the graph
+        self.assertFalse(torch.equal(computed1, computed2))
+        expected = batch_fn(waveform, dither=0.0)
+        self.assertEqual(computed1, expected, atol=1e-2, rtol=1e-3)
+        self.assertEqual(computed2, expected, atol=1e-2, rtol=1e-3)
+
+    def test_fbank_streaming_fallback(self):
+        """On CPU, fbank_streaming gives the same output as fbank_batch"""
+        self._test_streaming_fallback(kaldi.fbank_streaming, kaldi.fbank_batch)
+
+    @common_utils.skipIfNoCuda
+    def test_fbank_streaming_replay(self):
+        """Replaying the CUDA graph of fbank_streaming gives the output of fbank_batch for each input"""
+        self._test_streaming_replay(kaldi.fbank_streaming, kaldi.fbank_batch)
+
+    @common_utils.skipIfNoCuda
+    def test_fbank_streaming_replay_dither(self):
+        """Replaying the CUDA graph of fbank_streaming with dither draws new noise on each replay"""
+        self._test_streaming_replay_dither(kaldi.fbank_streaming, kaldi.fbank_batch)
+
+    def test_mfcc_streaming_fallback(self):
+        """On CPU, mfcc_streaming gives the same output as mfcc_batch"""
+        self._test_streaming_fallback(kaldi.mfcc_streaming, kaldi.mfcc_batch)
+
+    @common_utils.skipIfNoCuda
+    def test_mfcc_streaming_replay(self):
+        """Replaying the CUDA graph of mfcc_streaming gives the output of mfcc_batch for each input"""
+        self._test_streaming_replay(kaldi.mfcc_streaming, kaldi.mfcc_batch)
+
+    @common_utils.skipIfNoCuda
+    def test_mfcc_streaming_replay_dither(self):
+        """Replaying the CUDA graph of mfcc_streaming with dither draws new noise on each replay"""
+        self._test_streaming_replay_dither(kaldi.mfcc_streaming, kaldi.mfcc_batch)
+
+
+class TestKaldiComputeDtype(common_utils.TorchaudioTestCase):
+    def test_fbank_compute_dtype(self):
+        """fbank with a bfloat16 mel projection keeps the dtype and shape and is close to the default"""
+        waveform = common_utils.get_whitenoise(sample_rate=16000, duration=0.5, n_channels=2)
+        expected = kaldi.fbank_batch(waveform)
+        # the default and the dtype of the waveform give the same output
+        self.assertEqual(kaldi.fbank_batch(waveform, compute_dtype=None), expected, atol=0, rtol=0)
+        self.assertEqual(kaldi.fbank_batch(waveform, compute_dtype=torch.float32), expected, atol=0, rtol=0)
+
+        computed = kaldi.fbank_batch(waveform, compute_dtype=torch.bfloat16)
+        self.assertEqual(computed.dtype, waveform.dtype)
+        self.assertEqual(computed.shape, expected.shape)
+        # the log mel energies are off by about the bfloat16 relative precision of 2 ** -8
+        self.assertEqual(computed, expected, atol=5e-2, rtol=0)
+
+        computed = kaldi.fbank(waveform[:1], compute_dtype=torch.bfloat16)
+        self.assertEqual(computed, expected[0], atol=5e-2, rtol=0)
+
+    def test_mfcc_compute_dtype(self):
+        """mfcc with bfloat16 mel and cepstral projections keeps the dtype and shape and is close to the default"""
+        waveform = common_utils.get_whitenoise(sample_rate=16000, duration=0.5, n_channels=2)
+        # the log mel energies (up to about 20) are rounded to bfloat16 before the dct, which is an error
+        # of up to about 0.06 on each of them, and of about 0.07 on each cepstral coefficient before liftering
+        for kwargs in [{'cepstral_lifter': 0.0}, {'cepstral_lifter': 0.0, 'htk_compat': True}]:
+            expected = kaldi.mfcc_batch(waveform, **kwargs)
+            self.assertEqual(kaldi.mfcc_batch(waveform, compute_dtype=None, **kwargs), expected, atol=0, rtol=0)
+
+            computed = kaldi.mfcc_batch(waveform, compute_dtype=torch.bfloat16, **kwargs)
+            self.assertEqual(computed.dtype, waveform.dtype)
+            self.assertEqual(computed.shape, expected.shape)
+            # with htk_compat, C0 is also scaled by sqrt(2)
+            self.assertEqual(computed, expected, atol=0.15, rtol=2 ** -8)
+
+            computed = kaldi.mfcc(waveform[:1], compute_dtype=torch.bfloat16, **kwargs)
+            self.assertEqual(computed, expected[0], atol=0.15, rtol=2 ** -8)
+
+        # the lifter then scales the error of coefficients 1 to 12 by up to about 12
+        expected = kaldi.mfcc_batch(waveform)
+        computed = kaldi.mfcc_batch(waveform, compute_dtype=torch.bfloat16)
+        lifter = kaldi._get_lifter_coeffs(13, 22.0)
+        tolerance = 0.15 * lifter + 2 ** -8 * expected.abs()
+        self.assertTrue(((computed - expected).abs() <= tolerance).all())
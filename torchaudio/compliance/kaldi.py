@@ -1,4 +1,5 @@
-from typing import Tuple
+from functools import lru_cache
+from typing import Any, List, NamedTuple, Optional, Tuple
 
 import math
 import torch
@@ -6,6 +7,7 @@ from torch import Tensor
 
 import torchaudio
 import torchaudio._internal.fft
+from torchaudio._internal import module_utils as _mod_utils
 
 __all__ = [
     'get_mel_banks',
@@ -14,15 +16,20 @@ __all__ = [
     'mel_scale',
     'mel_scale_scalar',
     'spectrogram',
+    'spectrogram_batch',
     'fbank',
+    'fbank_batch',
+    'fbank_streaming',
     'mfcc',
+    'mfcc_batch',
+    'mfcc_streaming',
     'vtln_warp_freq',
     'vtln_warp_mel_freq',
     'resample_waveform',
 ]
 
 # numeric_limits<float>::epsilon() 1.1920928955078125e-07
-EPSILON = torch.tensor(torch.finfo(torch.float).eps)
+EPSILON = torch.finfo(torch.float).eps
 # 1 milliseconds = 0.001 seconds
 MILLISECONDS_TO_SECONDS = 0.001
 
@@ -34,9 +41,8 @@ RECTANGULAR = 'rectangular'
 BLACKMAN = 'blackman'
 WINDOWS = [HAMMING, HANNING, POVEY, RECTANGULAR, BLACKMAN]
 
-
-def _get_epsilon(device, dtype):
-    return EPSILON.to(device=device, dtype=dtype)
+# default sharpness of the resampling filter
+LOWPASS_FILTER_WIDTH = 6
 
 
 def _next_power_of_2(x: int) -> int:
@@ -61,30 +67,63 @@ def _get_strided(waveform: Tensor, window_size: int, window_shift: int, snip_edg
         Tensor: 2D tensor of size (m, ``window_size``) where each row is a frame
     """
     assert waveform.dim() == 1
-    num_samples = waveform.size(0)
-    strides = (window_shift * waveform.stride(0), waveform.stride(0))
+    return _get_strided_batch(waveform.unsqueeze(0), window_size, window_shift, snip_edges).squeeze(0)
+
+
+def _get_strided_batch(waveform: Tensor, window_size: int, window_shift: int, snip_edges: bool) -> Tensor:
+    r"""Batched version of :func:`_get_strided`. Given waveforms (2D tensor of size (B, ``num_samples``)),
+    it returns a 3D tensor (B, m, ``window_size``) where each row of each batch entry is a frame.
+
+    Args:
+        waveform (Tensor): Tensor of size (B, ``num_samples``)
+        window_size (int): Frame length
+        window_shift (int): Frame shift
+        snip_edges (bool): If True, end effects will be handled by outputting only frames that completely fit
+            in the file, and the number of frames depends on the frame_length.  If False, the number of frames
+            depends only on the frame_shift, and we reflect the data at the ends.
+
+    Returns:
+        Tensor: 3D tensor of size (B, m, ``window_size``) where each row is a frame
+    """
+    assert waveform.dim() == 2
+    batch_size, num_samples = waveform.shape
 
     if snip_edges:
         if num_samples < window_size:
-            return torch.empty((0, 0), dtype=waveform.dtype, device=waveform.device)
-        else:
-            m = 1 + (num_samples - window_size) // window_shift
+            return torch.empty((batch_size, 0, 0), dtype=waveform.dtype, device=waveform.device)
     else:
-        reversed_waveform = torch.flip(waveform, [0])
         m = (num_samples + (window_shift // 2)) // window_shift
+        if m == 0:
+            return torch.empty((batch_size, 0, window_size), dtype=waveform.dtype, device=waveform.device)
+        # if pad is negative, we want to trim the waveform at the front
         pad = window_size // 2 - window_shift // 2
-        pad_right = reversed_waveform
-        if pad > 0:
-            # torch.nn.functional.pad returns [2,1,0,1,2] for 'reflect'
-            # but we want [2, 1, 0, 0, 1, 2]
-            pad_left = reversed_waveform[-pad:]
-            waveform = torch.cat((pad_left, waveform, pad_right), dim=0)
-        else:
-            # pad is negative so we want to trim the waveform at the front
-            waveform = torch.cat((waveform[-pad:], pad_right), dim=0)
-
-    sizes = (m, window_size)
-    return waveform.as_strided(sizes, strides)
+        # the padded waveform covers the sample indices [start, end) of the original one
+        start = -pad
+        end = (m - 1) * window_shift + window_size - pad
+        # torch.nn.functional.pad returns [2,1,0,1,2] for 'reflect'
+        # but we want [2, 1, 0, 0, 1, 2], so we gather the samples of the
+        # padding from their reflected indices, while the samples inside
+        # the waveform are sliced directly
+        center_start = min(max(start, 0), num_samples)
+        center_end = max(min(end, num_samples), center_start)
+        waveform = torch.cat((
+            _get_reflected(waveform, start, min(end, 0)),
+            waveform[:, center_start:center_end],
+            _get_reflected(waveform, max(start, num_samples), end)), dim=1)
+
+    # size (B, m, window_size), a view on ``waveform``
+    return waveform.unfold(1, window_size, window_shift)
+
+
+def _get_reflected(waveform: Tensor, start: int, end: int) -> Tensor:
+    r"""Returns the samples of indices [start, end) of ``waveform`` (size (B, n)) reflected
+    at its ends as [..., 1, 0, 0, 1, ..., n - 1, n - 1, ...], of size (B, max(0, end - start))
+    """
+    num_samples = waveform.size(1)
+    indices = torch.arange(start, max(start, end), device=waveform.device)
+    indices = torch.remainder(indices, 2 * num_samples)
+    indices = torch.where(indices < num_samples, indices, 2 * num_samples - 1 - indices)
+    return waveform.index_select(1, indices)
 
 
 def _feature_window_function(window_type: str,
@@ -114,44 +153,129 @@ def _feature_window_function(window_type: str,
         raise Exception('Invalid window type ' + window_type)
 
 
+@lru_cache(maxsize=32)
+def _get_cached_window_function(window_type: str,
+                                window_size: int,
+                                blackman_coeff: float,
+                                device: torch.device,
+                                dtype: torch.dtype,
+                                ) -> Tensor:
+    r"""Memoized version of :func:`_feature_window_function`. The returned tensor is shared
+    between calls and must not be modified in place.
+    """
+    return _feature_window_function(window_type, window_size, blackman_coeff, device, dtype)
+
+
+@torch.jit.script
+def _safe_log_(x: Tensor, epsilon: float) -> Tensor:
+    r"""Returns the log of ``x`` clamped to ``epsilon``, computed in place on ``x``
+    """
+    return x.clamp_min_(epsilon).log_()
+
+
 def _get_log_energy(strided_input: Tensor,
-                    epsilon: Tensor,
+                    epsilon: float,
                     energy_floor: float) -> Tensor:
-    r"""Returns the log energy of size (m) for a strided_input (m,*)
+    r"""Returns the log energy of size (..., m) for a strided_input (..., m, *)
+    """
+    return _get_floored_log(strided_input.pow(2).sum(-1), epsilon, energy_floor)  # size (..., m)
+
+
+def _get_floored_log(energy: Tensor,
+                     epsilon: float,
+                     energy_floor: float) -> Tensor:
+    r"""Returns the log of ``energy`` floored by ``energy_floor``, computed in place
     """
-    device, dtype = strided_input.device, strided_input.dtype
-    log_energy = torch.max(strided_input.pow(2).sum(1), epsilon).log()  # size (m)
+    log_energy = _safe_log_(energy, epsilon)
     if energy_floor == 0.0:
         return log_energy
-    return torch.max(
-        log_energy, torch.tensor(math.log(energy_floor), device=device, dtype=dtype))
+    return log_energy.clamp_min_(math.log(energy_floor))
 
 
-def _get_waveform_and_window_properties(waveform: Tensor,
-                                        channel: int,
-                                        sample_frequency: float,
-                                        frame_shift: float,
-                                        frame_length: float,
-                                        round_to_power_of_two: bool,
-                                        preemphasis_coefficient: float) -> Tuple[Tensor, int, int, int]:
-    r"""Gets the waveform and window properties
+def _get_channel(waveform: Tensor, channel: int) -> Tensor:
+    r"""Returns the selected channel of a waveform (c, n) as a tensor of size (1, n)
     """
     channel = max(channel, 0)
     assert channel < waveform.size(0), ('Invalid channel {} for size {}'.format(channel, waveform.size(0)))
-    waveform = waveform[channel, :]  # size (n)
+    return waveform[channel:channel + 1, :]  # size (1, n)
+
+
+def _get_window_properties(waveform: Tensor,
+                           sample_frequency: float,
+                           frame_shift: float,
+                           frame_length: float,
+                           round_to_power_of_two: bool,
+                           preemphasis_coefficient: float) -> Tuple[int, int, int]:
+    r"""Gets the window properties for a waveform of size (B, n)
+    """
+    num_samples = waveform.size(-1)
     window_shift = int(sample_frequency * frame_shift * MILLISECONDS_TO_SECONDS)
     window_size = int(sample_frequency * frame_length * MILLISECONDS_TO_SECONDS)
     padded_window_size = _next_power_of_2(window_size) if round_to_power_of_two else window_size
 
-    assert 2 <= window_size <= len(
-        waveform), ('choose a window size {} that is [2, {}]'
-                    .format(window_size, len(waveform)))
+    assert 2 <= window_size <= num_samples, ('choose a window size {} that is [2, {}]'
+                                             .format(window_size, num_samples))
     assert 0 < window_shift, '`window_shift` must be greater than 0'
     assert padded_window_size % 2 == 0, 'the padded `window_size` must be divisible by two.' \
                                         ' use `round_to_power_of_two` or change `frame_length`'
     assert 0. <= preemphasis_coefficient <= 1.0, '`preemphasis_coefficient` must be between [0,1]'
     assert sample_frequency > 0, '`sample_frequency` must be greater than zero'
-    return waveform, window_shift, window_size, padded_window_size
+    return window_shift, window_size, padded_window_size
+
+
+def _apply_window(strided_input: Tensor,
+                  window_function: Tensor,
+                  padded_window_size: int,
+                  remove_dc_offset: bool,
+                  raw_energy: bool,
+                  energy_floor: float,
+                  preemphasis_coefficient: float,
+                  epsilon: float) -> Tuple[Tensor, Tensor]:
+    r"""Removes the DC offset, applies preemphasis and the window function to frames of size
+    (..., m, ``window_size``), and zero-pads them to ``padded_window_size``. The frames are copied once
+    into the padded output, and the preemphasis and window are then applied in place on it, so that
+    no intermediate tensor of the size of the frames is allocated.
+
+    Returns:
+        (Tensor, Tensor): strided_input of size (..., m, ``padded_window_size``) and
+        signal_log_energy of size (..., m)
+    """
+    window_size = window_function.size(0)
+
+    if remove_dc_offset:
+        # Subtract each row/frame by its mean
+        row_means = torch.mean(strided_input, dim=-1, keepdim=True)  # size (..., m, 1)
+        strided_input = strided_input - row_means
+
+    # Either compute the log energy of each row/frame before applying preemphasis and
+    # window function, or after window function (not the raw one)
+    energy_input = strided_input
+
+    # Columns past window_size stay zero until we reach size (..., m, padded_window_size)
+    size = strided_input.shape[:-1] + (padded_window_size,)
+    if padded_window_size != window_size:
+        windowed_input = torch.zeros(size, device=strided_input.device, dtype=strided_input.dtype)
+    else:
+        windowed_input = torch.empty(size, device=strided_input.device, dtype=strided_input.dtype)
+
+    # The remaining steps are done in place on windowed_input, which unlike strided_input is
+    # never a view on the waveform with overlapping frames
+    frames = windowed_input[..., :window_size]
+    frames.copy_(strided_input)
+
+    if preemphasis_coefficient != 0.0:
+        # strided_input[..., j] -= preemphasis_coefficient * strided_input[..., max(0, j-1)] for all j
+        frames[..., 1:].sub_(strided_input[..., :-1], alpha=preemphasis_coefficient)
+        frames[..., :1].mul_(1.0 - preemphasis_coefficient)
+
+    # Apply window_function to each row/frame
+    frames.mul_(window_function)
+
+    if not raw_energy:
+        energy_input = windowed_input
+
+    signal_log_energy = _get_log_energy(energy_input, epsilon, energy_floor)  # size (..., m)
+    return windowed_input, signal_log_energy
 
 
 def _get_window(waveform: Tensor,
@@ -165,63 +289,120 @@ def _get_window(waveform: Tensor,
                 energy_floor: float,
                 dither: float,
                 remove_dc_offset: bool,
-                preemphasis_coefficient: float) -> Tuple[Tensor, Tensor]:
-    r"""Gets a window and its log energy
+                preemphasis_coefficient: float,
+                backend: str = 'torch') -> Tuple[Tensor, Tensor]:
+    r"""Gets a window and its log energy for a batch of waveforms of size (B, n)
 
     Returns:
-        (Tensor, Tensor): strided_input of size (m, ``padded_window_size``) and signal_log_energy of size (m)
+        (Tensor, Tensor): strided_input of size (B, m, ``padded_window_size``) and signal_log_energy of size (B, m)
     """
+    assert backend in ('torch', 'numba'), 'Invalid backend ' + backend
     device, dtype = waveform.device, waveform.dtype
-    epsilon = _get_epsilon(device, dtype)
 
-    # size (m, window_size)
-    strided_input = _get_strided(waveform, window_size, window_shift, snip_edges)
+    if backend == 'numba' and _can_use_numba(waveform, snip_edges, dither):
+        window_function = _get_cached_window_function(window_type, window_size, blackman_coeff, device, dtype)
+        return _get_window_numba(waveform, padded_window_size, window_function, window_shift, raw_energy,
+                                 energy_floor, remove_dc_offset, preemphasis_coefficient)
+
+    # size (B, m, window_size)
+    strided_input = _get_strided_batch(waveform, window_size, window_shift, snip_edges)
 
     if dither != 0.0:
-        # Returns a random number strictly between 0 and 1
-        x = torch.max(epsilon, torch.rand(strided_input.shape, device=device, dtype=dtype))
-        rand_gauss = torch.sqrt(-2 * x.log()) * torch.cos(2 * math.pi * x)
-        strided_input = strided_input + rand_gauss * dither
+        # Add gaussian noise with standard deviation `dither`. This is not done in place, as
+        # strided_input is a view on the waveform whose frames may overlap.
+        strided_input = torch.add(strided_input, torch.randn_like(strided_input), alpha=dither)
 
-    if remove_dc_offset:
-        # Subtract each row/frame by its mean
-        row_means = torch.mean(strided_input, dim=1).unsqueeze(1)  # size (m, 1)
-        strided_input = strided_input - row_means
+    window_function = _get_cached_window_function(
+        window_type, window_size, blackman_coeff, device, dtype)  # size (window_size)
+    return _apply_window(strided_input, window_function, padded_window_size, remove_dc_offset, raw_energy,
+                         energy_floor, preemphasis_coefficient, EPSILON)
 
-    if raw_energy:
-        # Compute the log energy of each row/frame before applying preemphasis and
-        # window function
-        signal_log_energy = _get_log_energy(strided_input, epsilon, energy_floor)  # size (m)
 
-    if preemphasis_coefficient != 0.0:
-        # strided_input[i,j] -= preemphasis_coefficient * strided_input[i, max(0, j-1)] for all i,j
-        offset_strided_input = torch.nn.functional.pad(
-            strided_input.unsqueeze(0), (1, 0), mode='replicate').squeeze(0)  # size (m, window_size + 1)
-        strided_input = strided_input - preemphasis_coefficient * offset_strided_input[:, :-1]
+def _can_use_numba(waveform: Tensor, snip_edges: bool, dither: float) -> bool:
+    r"""Returns whether the numba implementation of _get_window covers this input
+    """
+    supported_input = waveform.device.type == 'cpu' and waveform.dtype == torch.float32 and not waveform.requires_grad
+    return supported_input and snip_edges and dither == 0.0 and _mod_utils.is_module_available('numba')
 
-    # Apply window_function to each row/frame
-    window_function = _feature_window_function(
-        window_type, window_size, blackman_coeff, device, dtype).unsqueeze(0)  # size (1, window_size)
-    strided_input = strided_input * window_function  # size (m, window_size)
 
-    # Pad columns with zero until we reach size (m, padded_window_size)
-    if padded_window_size != window_size:
-        padding_right = padded_window_size - window_size
-        strided_input = torch.nn.functional.pad(
-            strided_input.unsqueeze(0), (0, padding_right), mode='constant', value=0).squeeze(0)
+@lru_cache(maxsize=1)
+def _get_numba_window_kernel():
+    r"""Compiles (once, on first use) a numba kernel doing the framing, DC removal, preemphasis and
+    windowing in a single loop over each frame.
+    """
+    import numba
+
+    @numba.njit(parallel=True, fastmath=True)
+    def kernel(waveform, out, energy, window_function, window_shift, preemphasis_coefficient,
+               remove_dc_offset, raw_energy):
+        # waveform (B, n), out (B, m, padded_window_size) zero initialized, energy (B, m)
+        batch_size, num_frames = energy.shape
+        window_size = window_function.shape[0]
+        for k in numba.prange(batch_size * num_frames):
+            b = k // num_frames
+            i = k % num_frames
+            start = i * window_shift
+            frame = out[b, i]
+            offset = 0.0
+            if remove_dc_offset:
+                for j in range(window_size):
+                    offset += waveform[b, start + j]
+                offset /= window_size
+            raw_sum = 0.0
+            prev = 0.0
+            for j in range(window_size):
+                cur = waveform[b, start + j] - offset
+                raw_sum += cur * cur
+                if j == 0:
+                    # the first sample is preemphasized with itself
+                    prev = cur
+                frame[j] = (cur - preemphasis_coefficient * prev) * window_function[j]
+                prev = cur
+            if raw_energy:
+                energy[b, i] = raw_sum
+            else:
+                windowed_sum = 0.0
+                for j in range(window_size):
+                    windowed_sum += frame[j] * frame[j]
+                energy[b, i] = windowed_sum
+
+    return kernel
+
+
+def _get_window_numba(waveform: Tensor,
+                      padded_window_size: int,
+                      window_function: Tensor,
+                      window_shift: int,
+                      raw_energy: bool,
+                      energy_floor: float,
+                      remove_dc_offset: bool,
+                      preemphasis_coefficient: float) -> Tuple[Tensor, Tensor]:
+    r"""Same as _get_window for float32 CPU waveforms with ``snip_edges=True`` and no dither, with
+    all the per frame processing done in a single numba kernel writing directly to the output.
+    """
+    batch_size, num_samples = waveform.shape
+    window_size = window_function.size(0)
+    m = 1 + (num_samples - window_size) // window_shift
 
-    # Compute energy after window function (not the raw one)
-    if not raw_energy:
-        signal_log_energy = _get_log_energy(strided_input, epsilon, energy_floor)  # size (m)
+    strided_input = torch.zeros((batch_size, m, padded_window_size), dtype=waveform.dtype)
+    energy = torch.empty((batch_size, m), dtype=waveform.dtype)
+    _get_numba_window_kernel()(
+        waveform.contiguous().numpy(), strided_input.numpy(), energy.numpy(), window_function.numpy(),
+        window_shift, preemphasis_coefficient, remove_dc_offset, raw_energy)
+    return strided_input, _get_floored_log(energy, EPSILON, energy_floor)
 
-    return strided_input, signal_log_energy
+
+def _get_power_spectrum(fft: Tensor) -> Tensor:
+    r"""Returns the squared magnitude of a complex spectrum, without computing the magnitude itself
+    """
+    return fft.real.square().add_(fft.imag.square())
 
 
 def _subtract_column_mean(tensor: Tensor, subtract_mean: bool) -> Tensor:
-    # subtracts the column mean of the tensor size (m, n) if subtract_mean=True
-    # it returns size (m, n)
+    # subtracts the column mean of the tensor size (..., m, n) if subtract_mean=True
+    # it returns size (..., m, n)
     if subtract_mean:
-        col_means = torch.mean(tensor, dim=0).unsqueeze(0)
+        col_means = torch.mean(tensor, dim=-2, keepdim=True)
         tensor = tensor - col_means
     return tensor
 
@@ -261,7 +442,8 @@ def spectrogram(waveform: Tensor,
         raw_energy (bool, optional): If True, compute energy before preemphasis and windowing (Default: ``True``)
         remove_dc_offset (bool, optional): Subtract mean from waveform on each frame (Default: ``True``)
         round_to_power_of_two (bool, optional): If True, round window size to power of two by zero-padding input
-            to FFT. (Default: ``True``)
+            to FFT. If False, the FFT is computed directly on the (even) window size without any padding, which
+            is usually faster, e.g. for 400 samples frames. (Default: ``True``)
         sample_frequency (float, optional): Waveform data sample frequency (must match the waveform file, if
             specified there) (Default: ``16000.0``)
         snip_edges (bool, optional): If True, end effects will be handled by outputting only frames that completely fit
@@ -276,26 +458,60 @@ def spectrogram(waveform: Tensor,
         Tensor: A spectrogram identical to what Kaldi would output. The shape is
         (m, ``padded_window_size // 2 + 1``) where m is calculated in _get_strided
     """
+    return spectrogram_batch(
+        _get_channel(waveform, channel), blackman_coeff=blackman_coeff, dither=dither, energy_floor=energy_floor,
+        frame_length=frame_length, frame_shift=frame_shift, min_duration=min_duration,
+        preemphasis_coefficient=preemphasis_coefficient, raw_energy=raw_energy, remove_dc_offset=remove_dc_offset,
+        round_to_power_of_two=round_to_power_of_two, sample_frequency=sample_frequency, snip_edges=snip_edges,
+        subtract_mean=subtract_mean, window_type=window_type).squeeze(0)
+
+
+def spectrogram_batch(waveform: Tensor,
+                      blackman_coeff: float = 0.42,
+                      dither: float = 0.0,
+                      energy_floor: float = 1.0,
+                      frame_length: float = 25.0,
+                      frame_shift: float = 10.0,
+                      min_duration: float = 0.0,
+                      preemphasis_coefficient: float = 0.97,
+                      raw_energy: bool = True,
+                      remove_dc_offset: bool = True,
+                      round_to_power_of_two: bool = True,
+                      sample_frequency: float = 16000.0,
+                      snip_edges: bool = True,
+                      subtract_mean: bool = False,
+                      window_type: str = POVEY) -> Tensor:
+    r"""Create spectrograms from a batch of raw audio signals of the same length. This is equivalent to
+    calling :func:`spectrogram` on each waveform, but the framing, the FFT and the log are each computed
+    once for the whole batch.
+
+    Args:
+        waveform (Tensor): Tensor of audio of size (B, n)
+        Other arguments are the same as :func:`spectrogram`.
+
+    Returns:
+        Tensor: The spectrograms of size (B, m, ``padded_window_size // 2 + 1``) where m is calculated
+        in _get_strided
+    """
     device, dtype = waveform.device, waveform.dtype
-    epsilon = _get_epsilon(device, dtype)
 
-    waveform, window_shift, window_size, padded_window_size = _get_waveform_and_window_properties(
-        waveform, channel, sample_frequency, frame_shift, frame_length, round_to_power_of_two, preemphasis_coefficient)
+    window_shift, window_size, padded_window_size = _get_window_properties(
+        waveform, sample_frequency, frame_shift, frame_length, round_to_power_of_two, preemphasis_coefficient)
 
-    if len(waveform) < min_duration * sample_frequency:
+    if waveform.size(-1) < min_duration * sample_frequency:
         # signal is too short
-        return torch.empty(0)
+        return torch.empty((waveform.size(0), 0), device=device, dtype=dtype)
 
     strided_input, signal_log_energy = _get_window(
         waveform, padded_window_size, window_size, window_shift, window_type, blackman_coeff,
         snip_edges, raw_energy, energy_floor, dither, remove_dc_offset, preemphasis_coefficient)
 
-    # size (m, padded_window_size // 2 + 1, 2)
+    # size (B, m, padded_window_size // 2 + 1)
     fft = torchaudio._internal.fft.rfft(strided_input)
 
     # Convert the FFT into a power spectrum
-    power_spectrum = torch.max(fft.abs().pow(2.), epsilon).log()  # size (m, padded_window_size // 2 + 1)
-    power_spectrum[:, 0] = signal_log_energy
+    power_spectrum = _safe_log_(_get_power_spectrum(fft), EPSILON)  # size (B, m, padded_window_size // 2 + 1)
+    power_spectrum[..., 0] = signal_log_energy
 
     power_spectrum = _subtract_column_mean(power_spectrum, subtract_mean)
     return power_spectrum
@@ -359,6 +575,29 @@ def vtln_warp_freq(vtln_low_cutoff: float,
     Returns:
         Tensor: Freq after vtln warp
     """
+    return _vtln_warp_freq(
+        _get_vtln_params(vtln_low_cutoff, vtln_high_cutoff, low_freq, high_freq, vtln_warp_factor), freq)
+
+
+class _VTLNParams(NamedTuple):
+    r"""Constants of the piecewise linear VTLN warping function described in :func:`vtln_warp_freq`
+    """
+    l: float  # lower inflection point
+    h: float  # higher inflection point
+    scale: float  # slope of the center part
+    Fl: float  # F(l)
+    Fh: float  # F(h)
+    scale_left: float  # slope of the left part
+    scale_right: float  # slope of the right part
+    low_freq: float
+    high_freq: float
+
+
+def _get_vtln_params(vtln_low_cutoff: float,
+                     vtln_high_cutoff: float,
+                     low_freq: float,
+                     high_freq: float,
+                     vtln_warp_factor: float) -> _VTLNParams:
     assert vtln_low_cutoff > low_freq, 'be sure to set the vtln_low option higher than low_freq'
     assert vtln_high_cutoff < high_freq, 'be sure to set the vtln_high option lower than high_freq [or negative]'
     l = vtln_low_cutoff * max(1.0, vtln_warp_factor)
@@ -373,19 +612,25 @@ def vtln_warp_freq(vtln_low_cutoff: float,
 
     # slope of right part of the 3-piece linear function
     scale_right = (high_freq - Fh) / (high_freq - h)
+    return _VTLNParams(l, h, scale, Fl, Fh, scale_left, scale_right, low_freq, high_freq)
 
-    res = torch.empty_like(freq)
 
+def _vtln_warp_freq(params: _VTLNParams, freq: Tensor) -> Tensor:
+    r"""Same as :func:`vtln_warp_freq` with the constants of the warping function precomputed
+    """
+    low_freq, high_freq = params.low_freq, params.high_freq
     outside_low_high_freq = torch.lt(freq, low_freq) | torch.gt(freq, high_freq)  # freq < low_freq || freq > high_freq
-    before_l = torch.lt(freq, l)  # freq < l
-    before_h = torch.lt(freq, h)  # freq < h
-    after_h = torch.ge(freq, h)  # freq >= h
+    before_l = torch.lt(freq, params.l)  # freq < l
+    before_h = torch.lt(freq, params.h)  # freq < h
 
-    # order of operations matter here (since there is overlapping frequency regions)
-    res[after_h] = high_freq + scale_right * (freq[after_h] - high_freq)
-    res[before_h] = scale * freq[before_h]
-    res[before_l] = low_freq + scale_left * (freq[before_l] - low_freq)
-    res[outside_low_high_freq] = freq[outside_low_high_freq]
+    left_part = low_freq + params.scale_left * (freq - low_freq)
+    center_part = params.scale * freq
+    right_part = high_freq + params.scale_right * (freq - high_freq)
+
+    # order of selection matters here (since there is overlapping frequency regions)
+    res = torch.where(before_h, center_part, right_part)
+    res = torch.where(before_l, left_part, res)
+    res = torch.where(outside_low_high_freq, freq, res)
 
     return res
 
@@ -453,15 +698,17 @@ def get_mel_banks(num_bins: int,
         ('Bad values in options: vtln-low {} and vtln-high {}, versus '
          'low-freq {} and high-freq {}'.format(vtln_low, vtln_high, low_freq, high_freq))
 
-    bin = torch.arange(num_bins).unsqueeze(1)
-    left_mel = mel_low_freq + bin * mel_freq_delta  # size(num_bins, 1)
-    center_mel = mel_low_freq + (bin + 1.0) * mel_freq_delta  # size(num_bins, 1)
-    right_mel = mel_low_freq + (bin + 2.0) * mel_freq_delta  # size(num_bins, 1)
+    # the right edge of each triangle is the center of the next one and its center the left edge of
+    # the next one, so only num_bins + 2 distinct edges are needed, size (num_bins + 2, 1)
+    edges_mel = mel_low_freq + torch.arange(num_bins + 2).unsqueeze(1) * mel_freq_delta
 
     if vtln_warp_factor != 1.0:
-        left_mel = vtln_warp_mel_freq(vtln_low, vtln_high, low_freq, high_freq, vtln_warp_factor, left_mel)
-        center_mel = vtln_warp_mel_freq(vtln_low, vtln_high, low_freq, high_freq, vtln_warp_factor, center_mel)
-        right_mel = vtln_warp_mel_freq(vtln_low, vtln_high, low_freq, high_freq, vtln_warp_factor, right_mel)
+        params = _get_vtln_params(vtln_low, vtln_high, low_freq, high_freq, vtln_warp_factor)
+        edges_mel = mel_scale(_vtln_warp_freq(params, inverse_mel_scale(edges_mel)))
+
+    left_mel = edges_mel[:-2]  # size(num_bins, 1)
+    center_mel = edges_mel[1:-1]  # size(num_bins, 1)
+    right_mel = edges_mel[2:]  # size(num_bins, 1)
 
     center_freqs = inverse_mel_scale(center_mel)  # size (num_bins)
     # size(1, num_fft_bins)
@@ -473,18 +720,43 @@ def get_mel_banks(num_bins: int,
 
     if vtln_warp_factor == 1.0:
         # left_mel < center_mel < right_mel so we can min the two slopes and clamp negative values
-        bins = torch.max(torch.zeros(1), torch.min(up_slope, down_slope))
+        bins = torch.minimum(up_slope, down_slope).clamp_min_(0.0)
     else:
         # warping can move the order of left_mel, center_mel, right_mel anywhere
-        bins = torch.zeros_like(up_slope)
         up_idx = torch.gt(mel, left_mel) & torch.le(mel, center_mel)  # left_mel < mel <= center_mel
         down_idx = torch.gt(mel, center_mel) & torch.lt(mel, right_mel)  # center_mel < mel < right_mel
-        bins[up_idx] = up_slope[up_idx]
-        bins[down_idx] = down_slope[down_idx]
+        zero = torch.zeros((), dtype=up_slope.dtype)
+        bins = torch.where(up_idx, up_slope, torch.where(down_idx, down_slope, zero))
 
     return bins, center_freqs
 
 
+@lru_cache(maxsize=32)
+def _get_cached_mel_banks(num_bins: int,
+                          window_length_padded: int,
+                          sample_freq: float,
+                          low_freq: float,
+                          high_freq: float,
+                          vtln_low: float,
+                          vtln_high: float,
+                          vtln_warp_factor: float,
+                          device: torch.device,
+                          dtype: torch.dtype) -> Tensor:
+    r"""Memoized melbank of :func:`get_mel_banks`, moved to ``device`` and ``dtype``, padded with a
+    zero column so that it matches the size of the rfft output and transposed so that it can be
+    used directly as the right operand of the projection. The returned tensor is shared between
+    calls and must not be modified in place.
+
+    Returns:
+        Tensor: contiguous melbank of size (``window_length_padded // 2 + 1``, ``num_bins``)
+    """
+    bins, _ = get_mel_banks(num_bins, window_length_padded, sample_freq,
+                            low_freq, high_freq, vtln_low, vtln_high, vtln_warp_factor)
+    # pad right column with zeros, size (num_bins, window_length_padded // 2 + 1)
+    bins = torch.nn.functional.pad(bins, (0, 1), mode='constant', value=0)
+    return bins.to(device=device, dtype=dtype).T.contiguous()
+
+
 def fbank(waveform: Tensor,
           blackman_coeff: float = 0.42,
           channel: int = -1,
@@ -510,7 +782,9 @@ def fbank(waveform: Tensor,
           vtln_high: float = -500.0,
           vtln_low: float = 100.0,
           vtln_warp: float = 1.0,
-          window_type: str = POVEY) -> Tensor:
+          window_type: str = POVEY,
+          compute_dtype: Optional[torch.dtype] = None,
+          backend: str = 'torch') -> Tensor:
     r"""Create a fbank from a raw audio signal. This matches the input/output of Kaldi's
     compute-fbank-feats.
 
@@ -536,7 +810,8 @@ def fbank(waveform: Tensor,
         raw_energy (bool, optional): If True, compute energy before preemphasis and windowing (Default: ``True``)
         remove_dc_offset (bool, optional): Subtract mean from waveform on each frame (Default: ``True``)
         round_to_power_of_two (bool, optional): If True, round window size to power of two by zero-padding input
-            to FFT. (Default: ``True``)
+            to FFT. If False, the FFT is computed directly on the (even) window size without any padding, which
+            is usually faster, e.g. for 400 samples frames. (Default: ``True``)
         sample_frequency (float, optional): Waveform data sample frequency (must match the waveform file, if
             specified there) (Default: ``16000.0``)
         snip_edges (bool, optional): If True, end effects will be handled by outputting only frames that completely fit
@@ -553,57 +828,177 @@ def fbank(waveform: Tensor,
         vtln_warp (float, optional): Vtln warp factor (only applicable if vtln_map not specified) (Default: ``1.0``)
         window_type (str, optional): Type of window ('hamming'|'hanning'|'povey'|'rectangular'|'blackman')
          (Default: ``'povey'``)
+        compute_dtype (torch.dtype or None, optional): If not None, the projection of the spectrum on the mel
+            filterbank is computed in this lower precision dtype (e.g. ``torch.bfloat16``) to make use of faster
+            matrix multiplications, and converted back to the dtype of ``waveform`` before the log. The output is
+            then not identical to Kaldi's. ``torch.bfloat16`` is preferred over ``torch.float16``, whose range is
+            too small for the power spectrum of unnormalized audio. (Default: ``None``)
+        backend (str, optional): Implementation of the framing, preemphasis and windowing ('torch'|'numba').
+            ``'numba'`` runs these steps in a single JIT compiled loop, which is faster for small batches of
+            float32 waveforms on CPU. It is only used with ``snip_edges=True``, no dither and inputs that do
+            not require grad, and falls back to ``'torch'`` otherwise or if numba is not installed.
+            (Default: ``'torch'``)
 
     Returns:
         Tensor: A fbank identical to what Kaldi would output. The shape is (m, ``num_mel_bins + use_energy``)
         where m is calculated in _get_strided
     """
+    return fbank_batch(
+        _get_channel(waveform, channel), blackman_coeff=blackman_coeff, dither=dither, energy_floor=energy_floor,
+        frame_length=frame_length, frame_shift=frame_shift, high_freq=high_freq, htk_compat=htk_compat,
+        low_freq=low_freq, min_duration=min_duration, num_mel_bins=num_mel_bins,
+        preemphasis_coefficient=preemphasis_coefficient, raw_energy=raw_energy, remove_dc_offset=remove_dc_offset,
+        round_to_power_of_two=round_to_power_of_two, sample_frequency=sample_frequency, snip_edges=snip_edges,
+        subtract_mean=subtract_mean, use_energy=use_energy, use_log_fbank=use_log_fbank, use_power=use_power,
+        vtln_high=vtln_high, vtln_low=vtln_low, vtln_warp=vtln_warp, window_type=window_type,
+        compute_dtype=compute_dtype, backend=backend).squeeze(0)
+
+
+def fbank_batch(waveform: Tensor,
+                blackman_coeff: float = 0.42,
+                dither: float = 0.0,
+                energy_floor: float = 1.0,
+                frame_length: float = 25.0,
+                frame_shift: float = 10.0,
+                high_freq: float = 0.0,
+                htk_compat: bool = False,
+                low_freq: float = 20.0,
+                min_duration: float = 0.0,
+                num_mel_bins: int = 23,
+                preemphasis_coefficient: float = 0.97,
+                raw_energy: bool = True,
+                remove_dc_offset: bool = True,
+                round_to_power_of_two: bool = True,
+                sample_frequency: float = 16000.0,
+                snip_edges: bool = True,
+                subtract_mean: bool = False,
+                use_energy: bool = False,
+                use_log_fbank: bool = True,
+                use_power: bool = True,
+                vtln_high: float = -500.0,
+                vtln_low: float = 100.0,
+                vtln_warp: float = 1.0,
+                window_type: str = POVEY,
+                compute_dtype: Optional[torch.dtype] = None,
+                backend: str = 'torch') -> Tensor:
+    r"""Create fbanks from a batch of raw audio signals of the same length. This is equivalent to
+    calling :func:`fbank` on each waveform, but the framing, the FFT and the projection on the mel
+    filterbank are each computed once for the whole batch.
+
+    Args:
+        waveform (Tensor): Tensor of audio of size (B, n)
+        Other arguments are the same as :func:`fbank`.
+
+    Returns:
+        Tensor: The fbanks of size (B, m, ``num_mel_bins + use_energy``) where m is calculated in _get_strided
+    """
     device, dtype = waveform.device, waveform.dtype
 
-    waveform, window_shift, window_size, padded_window_size = _get_waveform_and_window_properties(
-        waveform, channel, sample_frequency, frame_shift, frame_length, round_to_power_of_two, preemphasis_coefficient)
+    window_shift, window_size, padded_window_size = _get_window_properties(
+        waveform, sample_frequency, frame_shift, frame_length, round_to_power_of_two, preemphasis_coefficient)
 
-    if len(waveform) < min_duration * sample_frequency:
+    if waveform.size(-1) < min_duration * sample_frequency:
         # signal is too short
-        return torch.empty(0, device=device, dtype=dtype)
+        return torch.empty((waveform.size(0), 0), device=device, dtype=dtype)
 
-    # strided_input, size (m, padded_window_size) and signal_log_energy, size (m)
+    # strided_input, size (B, m, padded_window_size) and signal_log_energy, size (B, m)
     strided_input, signal_log_energy = _get_window(
         waveform, padded_window_size, window_size, window_shift, window_type, blackman_coeff,
-        snip_edges, raw_energy, energy_floor, dither, remove_dc_offset, preemphasis_coefficient)
+        snip_edges, raw_energy, energy_floor, dither, remove_dc_offset, preemphasis_coefficient, backend)
 
-    # size (m, padded_window_size // 2 + 1)
-    spectrum = torchaudio._internal.fft.rfft(strided_input).abs()
-    if use_power:
-        spectrum = spectrum.pow(2.)
+    # size (B, m, padded_window_size // 2 + 1)
+    fft = torchaudio._internal.fft.rfft(strided_input)
+    spectrum = _get_power_spectrum(fft) if use_power else fft.abs()
 
-    # size (num_mel_bins, padded_window_size // 2)
-    mel_energies, _ = get_mel_banks(num_mel_bins, padded_window_size, sample_frequency,
-                                    low_freq, high_freq, vtln_low, vtln_high, vtln_warp)
-    mel_energies = mel_energies.to(device=device, dtype=dtype)
+    if compute_dtype is None:
+        compute_dtype = dtype
 
-    # pad right column with zeros and add dimension, size (num_mel_bins, padded_window_size // 2 + 1)
-    mel_energies = torch.nn.functional.pad(mel_energies, (0, 1), mode='constant', value=0)
+    # size (padded_window_size // 2 + 1, num_mel_bins)
+    mel_energies = _get_cached_mel_banks(num_mel_bins, padded_window_size, sample_frequency, low_freq,
+                                         high_freq, vtln_low, vtln_high, vtln_warp, device, compute_dtype)
 
-    # sum with mel fiterbanks over the power spectrum, size (m, num_mel_bins)
-    mel_energies = torch.mm(spectrum, mel_energies.T)
+    # sum with mel fiterbanks over the power spectrum, size (B, m, num_mel_bins).
+    # matmul folds the batch and frame dimensions into a single GEMM.
+    mel_energies = torch.matmul(spectrum.to(compute_dtype), mel_energies).to(dtype)
     if use_log_fbank:
         # avoid log of zero (which should be prevented anyway by dithering)
-        mel_energies = torch.max(mel_energies, _get_epsilon(device, dtype)).log()
+        mel_energies = _safe_log_(mel_energies, EPSILON)
 
     # if use_energy then add it as the last column for htk_compat == true else first column
     if use_energy:
-        signal_log_energy = signal_log_energy.unsqueeze(1)  # size (m, 1)
-        # returns size (m, num_mel_bins + 1)
+        signal_log_energy = signal_log_energy.unsqueeze(-1)  # size (B, m, 1)
+        # returns size (B, m, num_mel_bins + 1)
         if htk_compat:
-            mel_energies = torch.cat((mel_energies, signal_log_energy), dim=1)
+            mel_energies = torch.cat((mel_energies, signal_log_energy), dim=-1)
         else:
-            mel_energies = torch.cat((signal_log_energy, mel_energies), dim=1)
+            mel_energies = torch.cat((signal_log_energy, mel_energies), dim=-1)
 
     mel_energies = _subtract_column_mean(mel_energies, subtract_mean)
     return mel_energies
 
 
+@lru_cache(maxsize=8)
+def _get_feature_graph(function: Any,
+                       size: Tuple[int, int],
+                       device: torch.device,
+                       dtype: torch.dtype,
+                       options: Tuple[Tuple[str, Any], ...]) -> Tuple[Any, Tensor, Tensor]:
+    r"""Captures ``function`` (:func:`fbank_batch` or :func:`mfcc_batch`) with the given options in a CUDA graph,
+    for a static input of size ``size``
+
+    Returns:
+        (torch.cuda.CUDAGraph, Tensor, Tensor): The captured graph, the static input it reads from and the
+        static output it writes to
+    """
+    kwargs = dict(options)
+    static_input = torch.zeros(size, device=device, dtype=dtype)
+
+    # Warm up on a side stream, so that the cached window function, mel filterbank and dct matrix
+    # are allocated before the capture instead of inside the graph memory pool
+    stream = torch.cuda.Stream(device=device)
+    stream.wait_stream(torch.cuda.current_stream(device))
+    with torch.cuda.stream(stream):
+        function(static_input, **kwargs)
+    torch.cuda.current_stream(device).wait_stream(stream)
+
+    graph = torch.cuda.CUDAGraph()
+    with torch.cuda.graph(graph):
+        static_output = function(static_input, **kwargs)
+    return graph, static_input, static_output
+
+
+def _replay_feature_graph(function: Any, waveform: Tensor, kwargs: Any) -> Tensor:
+    r"""Computes ``function(waveform, **kwargs)`` by replaying its CUDA graph when possible, see
+    :func:`fbank_streaming`
+    """
+    if waveform.device.type != 'cuda' or waveform.requires_grad or not hasattr(torch.cuda, 'graph'):
+        return function(waveform, **kwargs)
+
+    graph, static_input, static_output = _get_feature_graph(
+        function, tuple(waveform.shape), waveform.device, waveform.dtype, tuple(sorted(kwargs.items())))
+    static_input.copy_(waveform)
+    graph.replay()
+    # static_output is overwritten by the next replay
+    return static_output.clone()
+
+
+def fbank_streaming(waveform: Tensor, **kwargs: Any) -> Tensor:
+    r"""Same as :func:`fbank_batch`, but on CUDA the whole computation is captured in a CUDA graph the
+    first time a given input size and set of options is seen, and subsequent calls only replay it.
+    This removes the per-kernel launch overhead, which dominates for the short chunks of audio
+    processed in streaming applications. On other devices, with PyTorch versions without CUDA graphs,
+    or when ``waveform`` requires grad, this falls back to :func:`fbank_batch`.
+
+    Args:
+        waveform (Tensor): Tensor of audio of size (B, n)
+        kwargs: Options passed to :func:`fbank_batch`
+
+    Returns:
+        Tensor: The fbanks of size (B, m, ``num_mel_bins + use_energy``) where m is calculated in _get_strided
+    """
+    return _replay_feature_graph(fbank_batch, waveform, kwargs)
+
+
 def _get_dct_matrix(num_ceps: int, num_mel_bins: int) -> Tensor:
     # returns a dct matrix of size (num_mel_bins, num_ceps)
     # size (num_mel_bins, num_mel_bins)
@@ -621,8 +1016,41 @@ def _get_lifter_coeffs(num_ceps: int, cepstral_lifter: float) -> Tensor:
     # returns size (num_ceps)
     # Compute liftering coefficients (scaling on cepstral coeffs)
     # coeffs are numbered slightly differently from HTK: the zeroth index is C0, which is not affected.
-    i = torch.arange(num_ceps)
-    return 1.0 + 0.5 * cepstral_lifter * torch.sin(math.pi * i / cepstral_lifter)
+    # the handful of coefficients are computed in Python, which is cheaper than dispatching tensor ops
+    return torch.tensor([1.0 + 0.5 * cepstral_lifter * math.sin(math.pi * i / cepstral_lifter)
+                         for i in range(num_ceps)])
+
+
+@lru_cache(maxsize=16)
+def _get_cached_cepstral_matrix(num_ceps: int,
+                                num_mel_bins: int,
+                                cepstral_lifter: float,
+                                scale_c0: bool,
+                                c0_last: bool,
+                                device: torch.device,
+                                dtype: torch.dtype) -> Tensor:
+    r"""Memoized dct matrix of :func:`_get_dct_matrix` with the liftering coefficients of
+    :func:`_get_lifter_coeffs` (if ``cepstral_lifter`` is not zero) and the scaling of C0 by
+    sqrt(2) (if ``scale_c0``) folded in, and with the column of C0 moved last (if ``c0_last``),
+    so that the cepstral coefficients are computed in their output order by a single matmul.
+    The returned tensor is shared between calls and must not be modified in place.
+
+    Returns:
+        Tensor: matrix of size (``num_mel_bins``, ``num_ceps``)
+    """
+    # the matrix is built in at least single precision and cast once, so that a low precision
+    # dtype only rounds the fused coefficients instead of each of their factors
+    build_dtype = torch.promote_types(dtype, torch.float32)
+    # size (num_mel_bins, num_ceps)
+    matrix = _get_dct_matrix(num_ceps, num_mel_bins).to(device=device, dtype=build_dtype)
+    if cepstral_lifter != 0.0:
+        # size (1, num_ceps)
+        matrix *= _get_lifter_coeffs(num_ceps, cepstral_lifter).unsqueeze(0).to(device=device, dtype=build_dtype)
+    if scale_c0:
+        matrix[:, 0] *= math.sqrt(2)
+    if c0_last:
+        matrix = torch.cat((matrix[:, 1:], matrix[:, :1]), dim=1)
+    return matrix.to(dtype).contiguous()
 
 
 def mfcc(
@@ -651,7 +1079,8 @@ def mfcc(
         vtln_high: float = -500.0,
         vtln_low: float = 100.0,
         vtln_warp: float = 1.0,
-        window_type: str = POVEY) -> Tensor:
+        window_type: str = POVEY,
+        compute_dtype: Optional[torch.dtype] = None) -> Tensor:
     r"""Create a mfcc from a raw audio signal. This matches the input/output of Kaldi's
     compute-mfcc-feats.
 
@@ -679,7 +1108,8 @@ def mfcc(
         raw_energy (bool, optional): If True, compute energy before preemphasis and windowing (Default: ``True``)
         remove_dc_offset (bool, optional): Subtract mean from waveform on each frame (Default: ``True``)
         round_to_power_of_two (bool, optional): If True, round window size to power of two by zero-padding input
-            to FFT. (Default: ``True``)
+            to FFT. If False, the FFT is computed directly on the (even) window size without any padding, which
+            is usually faster, e.g. for 400 samples frames. (Default: ``True``)
         sample_frequency (float, optional): Waveform data sample frequency (must match the waveform file, if
             specified there) (Default: ``16000.0``)
         snip_edges (bool, optional): If True, end effects will be handled by outputting only frames that completely fit
@@ -694,64 +1124,131 @@ def mfcc(
         vtln_warp (float, optional): Vtln warp factor (only applicable if vtln_map not specified) (Default: ``1.0``)
         window_type (str, optional): Type of window ('hamming'|'hanning'|'povey'|'rectangular'|'blackman')
          (Default: ``"povey"``)
+        compute_dtype (torch.dtype or None, optional): If not None, the projections of the spectrum on the mel
+            filterbank and of the log mel energies on the cepstral coefficients are computed in this lower
+            precision dtype (e.g. ``torch.bfloat16``) to make use of faster matrix multiplications, such as the
+            tensor cores of recent GPUs, see :func:`fbank`. The output is then not identical to Kaldi's: with
+            ``torch.bfloat16``, rounding the log mel energies gives errors of about 0.1 before liftering, which
+            the default ``cepstral_lifter`` scales to several tenths on the higher coefficients.
+            (Default: ``None``)
 
     Returns:
         Tensor: A mfcc identical to what Kaldi would output. The shape is (m, ``num_ceps``)
         where m is calculated in _get_strided
     """
+    return mfcc_batch(
+        _get_channel(waveform, channel), blackman_coeff=blackman_coeff, cepstral_lifter=cepstral_lifter,
+        dither=dither, energy_floor=energy_floor, frame_length=frame_length, frame_shift=frame_shift,
+        high_freq=high_freq, htk_compat=htk_compat, low_freq=low_freq, num_ceps=num_ceps,
+        min_duration=min_duration, num_mel_bins=num_mel_bins, preemphasis_coefficient=preemphasis_coefficient,
+        raw_energy=raw_energy, remove_dc_offset=remove_dc_offset, round_to_power_of_two=round_to_power_of_two,
+        sample_frequency=sample_frequency, snip_edges=snip_edges, subtract_mean=subtract_mean,
+        use_energy=use_energy, vtln_high=vtln_high, vtln_low=vtln_low, vtln_warp=vtln_warp,
+        window_type=window_type, compute_dtype=compute_dtype).squeeze(0)
+
+
+def mfcc_batch(
+        waveform: Tensor,
+        blackman_coeff: float = 0.42,
+        cepstral_lifter: float = 22.0,
+        dither: float = 0.0,
+        energy_floor: float = 1.0,
+        frame_length: float = 25.0,
+        frame_shift: float = 10.0,
+        high_freq: float = 0.0,
+        htk_compat: bool = False,
+        low_freq: float = 20.0,
+        num_ceps: int = 13,
+        min_duration: float = 0.0,
+        num_mel_bins: int = 23,
+        preemphasis_coefficient: float = 0.97,
+        raw_energy: bool = True,
+        remove_dc_offset: bool = True,
+        round_to_power_of_two: bool = True,
+        sample_frequency: float = 16000.0,
+        snip_edges: bool = True,
+        subtract_mean: bool = False,
+        use_energy: bool = False,
+        vtln_high: float = -500.0,
+        vtln_low: float = 100.0,
+        vtln_warp: float = 1.0,
+        window_type: str = POVEY,
+        compute_dtype: Optional[torch.dtype] = None) -> Tensor:
+    r"""Create mfccs from a batch of raw audio signals of the same length. This is equivalent to
+    calling :func:`mfcc` on each waveform, but the whole computation, including the projection on
+    the cepstral coefficients, is done once for the whole batch.
+
+    Args:
+        waveform (Tensor): Tensor of audio of size (B, n)
+        Other arguments are the same as :func:`mfcc`.
+
+    Returns:
+        Tensor: The mfccs of size (B, m, ``num_ceps``) where m is calculated in _get_strided
+    """
     assert num_ceps <= num_mel_bins, 'num_ceps cannot be larger than num_mel_bins: %d vs %d' % (num_ceps, num_mel_bins)
 
     device, dtype = waveform.device, waveform.dtype
 
     # The mel_energies should not be squared (use_power=True), not have mean subtracted
     # (subtract_mean=False), and use log (use_log_fbank=True).
-    # size (m, num_mel_bins + use_energy)
-    feature = fbank(waveform=waveform, blackman_coeff=blackman_coeff, channel=channel,
-                    dither=dither, energy_floor=energy_floor, frame_length=frame_length,
-                    frame_shift=frame_shift, high_freq=high_freq, htk_compat=htk_compat,
-                    low_freq=low_freq, min_duration=min_duration, num_mel_bins=num_mel_bins,
-                    preemphasis_coefficient=preemphasis_coefficient, raw_energy=raw_energy,
-                    remove_dc_offset=remove_dc_offset, round_to_power_of_two=round_to_power_of_two,
-                    sample_frequency=sample_frequency, snip_edges=snip_edges, subtract_mean=False,
-                    use_energy=use_energy, use_log_fbank=True, use_power=True,
-                    vtln_high=vtln_high, vtln_low=vtln_low, vtln_warp=vtln_warp, window_type=window_type)
+    # size (B, m, num_mel_bins + use_energy)
+    feature = fbank_batch(waveform, blackman_coeff=blackman_coeff,
+                          dither=dither, energy_floor=energy_floor, frame_length=frame_length,
+                          frame_shift=frame_shift, high_freq=high_freq, htk_compat=htk_compat,
+                          low_freq=low_freq, min_duration=min_duration, num_mel_bins=num_mel_bins,
+                          preemphasis_coefficient=preemphasis_coefficient, raw_energy=raw_energy,
+                          remove_dc_offset=remove_dc_offset, round_to_power_of_two=round_to_power_of_two,
+                          sample_frequency=sample_frequency, snip_edges=snip_edges, subtract_mean=False,
+                          use_energy=use_energy, use_log_fbank=True, use_power=True,
+                          vtln_high=vtln_high, vtln_low=vtln_low, vtln_warp=vtln_warp, window_type=window_type,
+                          compute_dtype=compute_dtype)
+
+    if feature.dim() == 2:
+        # signal is too short
+        return feature
 
     if use_energy:
-        # size (m)
-        signal_log_energy = feature[:, num_mel_bins if htk_compat else 0]
+        # size (B, m)
+        signal_log_energy = feature[..., num_mel_bins if htk_compat else 0]
         # offset is 0 if htk_compat==True else 1
         mel_offset = int(not htk_compat)
-        feature = feature[:, mel_offset:(num_mel_bins + mel_offset)]
+        feature = feature[..., mel_offset:(num_mel_bins + mel_offset)]
 
-    # size (num_mel_bins, num_ceps)
-    dct_matrix = _get_dct_matrix(num_ceps, num_mel_bins).to(dtype=dtype, device=device)
+    # size (num_mel_bins, num_ceps). With htk_compat, C0 is put last and scaled by sqrt(2) (actually
+    # removing a scale we previously added that's part of one common definition of the cosine transform.),
+    # unless it is replaced by the energy
+    if compute_dtype is None:
+        compute_dtype = dtype
+    cepstral_matrix = _get_cached_cepstral_matrix(
+        num_ceps, num_mel_bins, cepstral_lifter, htk_compat and not use_energy, htk_compat, device, compute_dtype)
 
-    # size (m, num_ceps)
-    feature = feature.matmul(dct_matrix)
-
-    if cepstral_lifter != 0.0:
-        # size (1, num_ceps)
-        lifter_coeffs = _get_lifter_coeffs(num_ceps, cepstral_lifter).unsqueeze(0)
-        feature *= lifter_coeffs.to(device=device, dtype=dtype)
+    # size (B, m, num_ceps), the log mel energies are computed in place by fbank so they
+    # are read once by the matmul without any intermediate copy
+    feature = feature.to(compute_dtype).matmul(cepstral_matrix).to(dtype)
 
     # if use_energy then replace the last column for htk_compat == true else first column
     if use_energy:
-        feature[:, 0] = signal_log_energy
-
-    if htk_compat:
-        energy = feature[:, 0].unsqueeze(1)  # size (m, 1)
-        feature = feature[:, 1:]  # size (m, num_ceps - 1)
-        if not use_energy:
-            # scale on C0 (actually removing a scale we previously added that's
-            # part of one common definition of the cosine transform.)
-            energy *= math.sqrt(2)
-
-        feature = torch.cat((feature, energy), dim=1)
+        feature[..., -1 if htk_compat else 0] = signal_log_energy
 
     feature = _subtract_column_mean(feature, subtract_mean)
     return feature
 
 
+def mfcc_streaming(waveform: Tensor, **kwargs: Any) -> Tensor:
+    r"""Same as :func:`mfcc_batch`, but on CUDA the whole computation is captured in a CUDA graph the
+    first time a given input size and set of options is seen, and subsequent calls only replay it,
+    as in :func:`fbank_streaming`.
+
+    Args:
+        waveform (Tensor): Tensor of audio of size (B, n)
+        kwargs: Options passed to :func:`mfcc_batch`
+
+    Returns:
+        Tensor: The mfccs of size (B, m, ``num_ceps``) where m is calculated in _get_strided
+    """
+    return _replay_feature_graph(mfcc_batch, waveform, kwargs)
+
+
 def _get_LR_indices_and_weights(orig_freq: float,
                                 new_freq: float,
                                 output_samples_in_unit: int,
@@ -821,24 +1318,31 @@ def _get_LR_indices_and_weights(orig_freq: float,
     input_index = min_input_index.unsqueeze(1) + j
     delta_t = (input_index / orig_freq) - output_t.unsqueeze(1)
 
-    weights = torch.zeros_like(delta_t)
-    inside_window_indices = delta_t.abs().lt(window_width)
-    # raised-cosine (Hanning) window with width `window_width`
-    weights[inside_window_indices] = 0.5 * (1 + torch.cos(2 * math.pi * lowpass_cutoff /
-                                                          lowpass_filter_width * delta_t[inside_window_indices]))
-
-    t_eq_zero_indices = delta_t.eq(0.0)
-    t_not_eq_zero_indices = ~t_eq_zero_indices
-    # sinc filter function
-    weights[t_not_eq_zero_indices] *= torch.sin(
-        2 * math.pi * lowpass_cutoff * delta_t[t_not_eq_zero_indices]) / (math.pi * delta_t[t_not_eq_zero_indices])
-    # limit of the function at t = 0
-    weights[t_eq_zero_indices] *= 2 * lowpass_cutoff
-
-    weights /= orig_freq  # size (output_samples_in_unit, max_weight_width)
+    # size (output_samples_in_unit, max_weight_width)
+    weights = _get_windowed_sinc(delta_t, window_width, lowpass_cutoff, lowpass_filter_width, orig_freq)
     return min_input_index, weights
 
 
+@torch.jit.script
+def _get_windowed_sinc(delta_t: Tensor,
+                       window_width: float,
+                       lowpass_cutoff: float,
+                       lowpass_filter_width: int,
+                       orig_freq: float) -> Tensor:
+    r"""Returns the weights of :func:`_get_LR_indices_and_weights` for the time offsets ``delta_t``,
+    computed without any masked indexing so that the pointwise operations can be fused.
+    """
+    # raised-cosine (Hanning) window with width `window_width`
+    window = 0.5 * (1 + torch.cos(2 * math.pi * lowpass_cutoff / lowpass_filter_width * delta_t))
+    window = torch.where(delta_t.abs() < window_width, window, torch.zeros_like(window))
+
+    # sinc filter function sin(2 pi f t) / (pi t), where torch.sinc(x) = sin(pi x) / (pi x)
+    # handles the limit at t = 0 without computing and selecting a second branch
+    sinc = 2 * lowpass_cutoff * torch.sinc(2 * lowpass_cutoff * delta_t)
+
+    return window * sinc / orig_freq
+
+
 def _lcm(a: int, b: int) -> int:
     return abs(a * b) // math.gcd(a, b)
 
@@ -889,10 +1393,102 @@ def _get_num_LR_output_samples(input_num_samp: int,
     return num_output_samp
 
 
+@lru_cache(maxsize=16)
+def _get_cached_LR_kernel(orig_freq: float,
+                          new_freq: float,
+                          lowpass_filter_width: int,
+                          device: torch.device,
+                          dtype: torch.dtype) -> Tuple[List[Tuple[int, Tensor]], int]:
+    r"""Memoized version of :func:`_get_LR_kernels`. The returned tensors are shared between calls and
+    must not be modified in place.
+    """
+    return _get_LR_kernels(orig_freq, new_freq, lowpass_filter_width, device, dtype)
+
+
+def _get_LR_kernels(orig_freq: float,
+                    new_freq: float,
+                    lowpass_filter_width: int,
+                    device: torch.device,
+                    dtype: torch.dtype) -> Tuple[List[Tuple[int, Tensor]], int]:
+    r"""Kernels of :func:`_get_LR_kernel` used by :func:`resample_waveform` to resample
+    from ``orig_freq`` to ``new_freq``.
+
+    Returns:
+        (List[Tuple[int, Tensor]], int): A tuple of the kernels of each group of phases with their offset and
+        the smallest first index, from which the kernels are valid.
+    """
+    min_freq = min(orig_freq, new_freq)
+    lowpass_cutoff = 0.99 * 0.5 * min_freq
+
+    assert lowpass_cutoff * 2 <= min_freq
+
+    base_freq = math.gcd(int(orig_freq), int(new_freq))
+    output_samples_in_unit = int(new_freq) // base_freq
+
+    window_width = lowpass_filter_width / (2.0 * lowpass_cutoff)
+    # the weights are computed in at least single precision and cast once built, as the
+    # time offsets and trigonometric functions are too inaccurate in half precision
+    first_indices, weights = _get_LR_indices_and_weights(
+        orig_freq, new_freq, output_samples_in_unit,
+        window_width, lowpass_cutoff, lowpass_filter_width, device, torch.promote_types(dtype, torch.float32))
+
+    assert first_indices.dim() == 1
+    # All the weights have the same stride but start at different first_indices, so they are
+    # shifted into kernels which align them on the smallest one, and a matmul per kernel
+    # computes all the phases of the output it covers at once.
+    kernels, first_index = _get_LR_kernel(first_indices, weights)
+    cast_kernels: List[Tuple[int, Tensor]] = []
+    for start, kernel in kernels:
+        cast_kernels.append((start, kernel.to(dtype)))
+    return cast_kernels, first_index
+
+
+def _get_LR_kernel(first_indices: Tensor, weights: Tensor) -> Tuple[List[Tuple[int, Tensor]], int]:
+    r"""Stacks the weights of each output phase (which are valid from their respective ``first_indices``)
+    into the columns of a kernel, shifting each of them by its offset to the smallest first index.
+
+    As the first indices grow with the phase, a single kernel for all the phases is mostly zeros when
+    the offset between the first and the last phase (about ``orig_freq / base_freq``) is large compared
+    to ``max_weight_width``. The consecutive phases are then split into groups, each with a narrower
+    kernel starting at the offset of its first phase.
+
+    Args:
+        first_indices (Tensor): The minimum indices where the weights are valid, size (``output_samples_in_unit``)
+        weights (Tensor): The weights, size (``output_samples_in_unit``, ``max_weight_width``)
+
+    Returns:
+        (List[Tuple[int, Tensor]], int): A tuple of the list of (offset, kernel) for each group of phases,
+        where the kernel has size (``kernel_width``, ``num_phases_in_group``), and the smallest first index,
+        from which the kernels are valid.
+    """
+    first_indices = first_indices.long()
+    first_index = int(first_indices.min().item())
+    offsets = first_indices - first_index  # size (output_samples_in_unit)
+    output_samples_in_unit, window_size = weights.size(0), weights.size(1)
+    kernel_width = int(offsets.max().item()) + window_size
+
+    # size (output_samples_in_unit, max_weight_width)
+    index = offsets.unsqueeze(1) + torch.arange(window_size, device=weights.device).unsqueeze(0)
+    kernel = weights.new_zeros((output_samples_in_unit, kernel_width)).scatter_(1, index, weights)
+    kernel = kernel.t()  # size (kernel_width, output_samples_in_unit)
+
+    # splitting in more groups saves multiplications by zero, but each group is a separate matmul
+    # and the outputs of the groups have to be concatenated
+    num_groups = max(1, min(output_samples_in_unit, kernel_width // (4 * window_size)))
+    kernels: List[Tuple[int, Tensor]] = []
+    for group in range(num_groups):
+        first_phase = group * output_samples_in_unit // num_groups
+        last_phase = (group + 1) * output_samples_in_unit // num_groups
+        start = int(offsets[first_phase].item())
+        end = int(offsets[last_phase - 1].item()) + window_size
+        kernels.append((start, kernel[start:end, first_phase:last_phase].contiguous()))
+    return kernels, first_index
+
+
 def resample_waveform(waveform: Tensor,
                       orig_freq: float,
                       new_freq: float,
-                      lowpass_filter_width: int = 6) -> Tensor:
+                      lowpass_filter_width: int = LOWPASS_FILTER_WIDTH) -> Tensor:
     r"""Resamples the waveform at the new frequency. This matches Kaldi's OfflineFeatureTpl ResampleWaveform
     which uses a LinearResample (resample a signal at linearly spaced intervals to upsample/downsample
     a signal). LinearResample (LR) means that the output signal is at linearly spaced intervals (i.e
@@ -902,6 +1498,13 @@ def resample_waveform(waveform: Tensor,
     https://ccrma.stanford.edu/~jos/resample/Theory_Ideal_Bandlimited_Interpolation.html
     https://github.com/kaldi-asr/kaldi/blob/master/src/feat/resample.h#L56
 
+    The filter is built directly on the device and with the dtype of ``waveform``, and is cached for each
+    ``(orig_freq, new_freq, lowpass_filter_width)``, device and dtype, so that only the first call pays for
+    its construction. Subsequent calls only run one product per group of output phases without any host
+    synchronization: a matmul on strided frames of the input on CPU, and a ``conv1d`` followed by a copy
+    interleaving the phases on CUDA. The resampling can thus be done on the device as part of the
+    feature extraction.
+
     Args:
         waveform (Tensor): The input signal of size (c, n)
         orig_freq (float): The original frequency of the signal
@@ -917,67 +1520,61 @@ def resample_waveform(waveform: Tensor,
     assert waveform.dim() == 2
     assert orig_freq > 0.0 and new_freq > 0.0
 
-    min_freq = min(orig_freq, new_freq)
-    lowpass_cutoff = 0.99 * 0.5 * min_freq
-
-    assert lowpass_cutoff * 2 <= min_freq
-
-    base_freq = math.gcd(int(orig_freq), int(new_freq))
-    input_samples_in_unit = int(orig_freq) // base_freq
-    output_samples_in_unit = int(new_freq) // base_freq
-
-    window_width = lowpass_filter_width / (2.0 * lowpass_cutoff)
-    first_indices, weights = _get_LR_indices_and_weights(
-        orig_freq, new_freq, output_samples_in_unit,
-        window_width, lowpass_cutoff, lowpass_filter_width, device, dtype)
+    # list of (offset, kernel of size (kernel_width, num_phases_in_group))
+    if torch.jit.is_scripting():
+        kernels, first_index = _get_LR_kernels(orig_freq, new_freq, lowpass_filter_width, device, dtype)
+    else:
+        kernels, first_index = _get_cached_LR_kernel(orig_freq, new_freq, lowpass_filter_width, device, dtype)
+    input_samples_in_unit = int(orig_freq) // math.gcd(int(orig_freq), int(new_freq))
+    output_samples_in_unit = 0
+    kernel_width = 0
+    for start, kernel in kernels:
+        output_samples_in_unit += kernel.size(1)
+        kernel_width = max(kernel_width, start + kernel.size(0))
 
-    assert first_indices.dim() == 1
-    # TODO figure a better way to do this. conv1d reaches every element i*stride + padding
-    # all the weights have the same stride but have different padding.
-    # Current implementation takes the input and applies the various padding before
-    # doing a conv1d for that specific weight.
     conv_stride = input_samples_in_unit
-    conv_transpose_stride = output_samples_in_unit
     num_channels, wave_len = waveform.size()
-    window_size = weights.size(1)
     tot_output_samp = _get_num_LR_output_samples(wave_len, orig_freq, new_freq)
-    output = torch.zeros((num_channels, tot_output_samp),
-                         device=device, dtype=dtype)
-    # eye size: (num_channels, num_channels, 1)
-    eye = torch.eye(num_channels, device=device, dtype=dtype).unsqueeze(2)
-    for i in range(first_indices.size(0)):
-        wave_to_conv = waveform
-        first_index = int(first_indices[i].item())
-        if first_index >= 0:
-            # trim the signal as the filter will not be applied before the first_index
-            wave_to_conv = wave_to_conv[..., first_index:]
-
-        # pad the right of the signal to allow partial convolutions meaning compute
-        # values for partial windows (e.g. end of the window is outside the signal length)
-        max_unit_index = (tot_output_samp - 1) // output_samples_in_unit
-        end_index_of_last_window = max_unit_index * conv_stride + window_size
-        current_wave_len = wave_len - first_index
-        right_padding = max(0, end_index_of_last_window + 1 - current_wave_len)
-
-        left_padding = max(0, -first_index)
-        if left_padding != 0 or right_padding != 0:
-            wave_to_conv = torch.nn.functional.pad(wave_to_conv, (left_padding, right_padding))
-
-        conv_wave = torch.nn.functional.conv1d(
-            wave_to_conv.unsqueeze(0), weights[i].repeat(num_channels, 1, 1),
-            stride=conv_stride, groups=num_channels)
-
-        # we want conv_wave[:, i] to be at output[:, i + n*conv_transpose_stride]
-        dilated_conv_wave = torch.nn.functional.conv_transpose1d(
-            conv_wave, eye, stride=conv_transpose_stride).squeeze(0)
-
-        # pad dilated_conv_wave so it reaches the output length if needed.
-        dialated_conv_wave_len = dilated_conv_wave.size(-1)
-        left_padding = i
-        right_padding = max(0, tot_output_samp - (left_padding + dialated_conv_wave_len))
-        dilated_conv_wave = torch.nn.functional.pad(
-            dilated_conv_wave, (left_padding, right_padding))[..., :tot_output_samp]
-
-        output += dilated_conv_wave
-
-    return output
+    # number of output samples computed for each phase
+    num_units = (tot_output_samp + output_samples_in_unit - 1) // output_samples_in_unit
+
+    wave_to_conv = waveform
+    if first_index >= 0:
+        # trim the signal as the filter will not be applied before the first_index
+        wave_to_conv = wave_to_conv[..., first_index:]
+
+    # pad the right of the signal to allow partial convolutions meaning compute
+    # values for partial windows (e.g. end of the window is outside the signal length)
+    end_index_of_last_window = (num_units - 1) * conv_stride + kernel_width
+    current_wave_len = wave_len - first_index
+    right_padding = max(0, end_index_of_last_window - current_wave_len)
+
+    left_padding = max(0, -first_index)
+    if left_padding != 0 or right_padding != 0:
+        wave_to_conv = torch.nn.functional.pad(wave_to_conv, (left_padding, right_padding))
+
+    # On CUDA, matmul copies the overlapping frames of the unfold view into a tensor of size
+    # (num_channels, num_units, kernel_width), which is many times the size of the input when
+    # conv_stride is small compared to kernel_width (e.g. kernel_width / conv_stride = 13 for
+    # 8 kHz to 16 kHz). conv1d reads the input directly, at the price of interleaving its output.
+    use_conv = waveform.device.type == 'cuda'
+    outputs = []
+    for start, kernel in kernels:
+        if use_conv:
+            # size (num_channels, num_phases_in_group, >= num_units)
+            conv_wave = torch.nn.functional.conv1d(
+                wave_to_conv[:, start:].unsqueeze(1), kernel.t().unsqueeze(1), stride=conv_stride)
+            # size (num_channels, num_units, num_phases_in_group), not contiguous
+            outputs.append(conv_wave[..., :num_units].transpose(1, 2))
+        else:
+            # size (num_channels, num_units, kernel_width), a view on ``wave_to_conv``
+            frames = wave_to_conv[:, start:].unfold(1, kernel.size(0), conv_stride)[:, :num_units]
+            # size (num_channels, num_units, num_phases_in_group)
+            outputs.append(torch.matmul(frames, kernel))
+
+    # we want the output of phase i for frame n to be at output[:, i + n * output_samples_in_unit],
+    # which is the memory layout of the matmul output, so on CPU the phases are interleaved by a view.
+    # The conv1d output is (num_channels, num_phases_in_group, num_units) instead, and is interleaved by
+    # the copy of the concatenation, or of the reshape for a single group.
+    output = outputs[0] if len(outputs) == 1 else torch.cat(outputs, dim=-1)
+    return output.reshape(num_channels, -1)[..., :tot_output_samp]